@@ -0,0 +1,45 @@
+from pydantic import BaseModel
+from functools import lru_cache
+from typing import List, Optional
+import os
+
+# Settings the AI service cannot run without, by environment variable name
+REQUIRED_AZURE_VARS = (
+    'AZURE_OPENAI_API_KEY',
+    'AZURE_OPENAI_ENDPOINT',
+    'AZURE_OPENAI_DEPLOYMENT_NAME'
+)
+
+# Concurrent Azure OpenAI calls allowed when AZURE_OPENAI_MAX_CONCURRENCY is unset or invalid
+DEFAULT_AZURE_OPENAI_MAX_CONCURRENCY = 16
+
+class Settings(BaseModel):
+    """Azure OpenAI configuration read from the environment"""
+    azure_openai_api_key: Optional[str] = None
+    azure_openai_endpoint: Optional[str] = None
+    azure_openai_deployment_name: Optional[str] = None
+    azure_openai_api_version: str = '2023-07-01-preview'
+    azure_openai_max_concurrency: int = DEFAULT_AZURE_OPENAI_MAX_CONCURRENCY
+
+    @property
+    def missing_azure_vars(self) -> List[str]:
+        """Names of the required Azure OpenAI environment variables that are unset or empty"""
+        return [var for var in REQUIRED_AZURE_VARS if not getattr(self, var.lower())]
+
+def get_max_concurrency() -> int:
+    """AZURE_OPENAI_MAX_CONCURRENCY as a positive int, falling back to the default when empty or invalid"""
+    try:
+        return max(1, int(os.getenv('AZURE_OPENAI_MAX_CONCURRENCY') or DEFAULT_AZURE_OPENAI_MAX_CONCURRENCY))
+    except ValueError:
+        return DEFAULT_AZURE_OPENAI_MAX_CONCURRENCY
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Read the settings from the environment once; later calls reuse them"""
+    return Settings(
+        azure_openai_api_key=os.getenv('AZURE_OPENAI_API_KEY'),
+        azure_openai_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
+        azure_openai_deployment_name=os.getenv('AZURE_OPENAI_DEPLOYMENT_NAME'),
+        azure_openai_api_version=os.getenv('AZURE_OPENAI_API_VERSION') or '2023-07-01-preview',
+        azure_openai_max_concurrency=get_max_concurrency()
+    )
@@ -1,17 +1,47 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy import create_engine, event, Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
+from typing import List
 import os
+import logging
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Database URL
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./quantipeak.db")
 
 # Create engine
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+if "sqlite" in DATABASE_URL:
+    # The routes are async def and use their sessions on the event loop, so a
+    # wait for a competing writer's lock blocks every request; sqlite3's default
+    # 5 second busy timeout is kept rather than raised
+    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL so reads don't block on writes, and skip the fsync on every commit"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+        cursor.close()
+else:
+    # Check pooled connections before use and recycle them before server-side idle timeouts
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=20,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=1800
+    )
 
 # Create session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -19,6 +49,10 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create base class
 Base = declarative_base()
 
+# JSON columns are stored as binary JSONB on PostgreSQL, so reads skip reparsing
+# text; other databases keep the generic JSON type
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 # Database Models
 class Candidate(Base):
     __tablename__ = "candidates"
@@ -29,11 +63,11 @@ class Candidate(Base):
     phone = Column(String)
     linkedin = Column(String)
     website = Column(String)
-    skills = Column(JSON)  # List of skills
-    experience = Column(JSON)  # List of experience objects
-    education = Column(JSON)  # List of education entries
+    skills = Column(JSONType)  # List of skills
+    experience = Column(JSONType)  # List of experience objects
+    education = Column(JSONType)  # List of education entries
     summary = Column(Text)
-    projects = Column(JSON)  # List of projects
+    projects = Column(JSONType)  # List of projects
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -49,7 +83,7 @@ class Job(Base):
     company = Column(String, nullable=False)
     location = Column(String)
     description = Column(Text)
-    job_url = Column(String)
+    job_url = Column(String, unique=True, index=True)  # Searches look jobs up by URL
     company_url = Column(String)
     source = Column(String)  # linkedin, indeed, etc.
     posted_date = Column(DateTime)
@@ -69,6 +103,11 @@ class SelectedJob(Base):
     # Relationships
     candidate = relationship("Candidate", back_populates="selected_jobs")
     job = relationship("Job", back_populates="selected_jobs")
+    
+    # Selections are looked up by candidate, and a job is selected at most once per candidate
+    __table_args__ = (
+        Index('ix_selected_jobs_candidate_job', 'candidate_id', 'job_id', unique=True),
+    )
 
 class GeneratedDocument(Base):
     __tablename__ = "generated_documents"
@@ -82,6 +121,36 @@ class GeneratedDocument(Base):
     
     # Relationships
     candidate = relationship("Candidate", back_populates="generated_documents")
+    
+    __table_args__ = (
+        Index('ix_generated_documents_candidate_job_type', 'candidate_id', 'job_id', 'document_type'),
+    )
+
+def get_or_create_jobs(db, job_rows: List[dict]) -> List[Job]:
+    """Return the Job for each scraped row, inserting the ones not stored yet in a single batch"""
+    job_urls = [row['job_url'] for row in job_rows]
+    existing_urls = {url for (url,) in db.query(Job.job_url).filter(Job.job_url.in_(job_urls))}
+    
+    # job_url is unique, so a URL listed twice in one search is inserted once
+    new_jobs = []
+    for row in job_rows:
+        if row['job_url'] not in existing_urls:
+            existing_urls.add(row['job_url'])
+            new_jobs.append(Job(**row, source='scraped', scraped_at=datetime.utcnow()))
+    if new_jobs:
+        db.add_all(new_jobs)
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent search stored some of the same URLs first; keep its
+            # rows and insert the rest
+            db.rollback()
+            logger.info("Jobs were stored by a concurrent search, retrying the insert")
+            return get_or_create_jobs(db, job_rows)
+    
+    # One query loads every job, new ones included, instead of a refresh per row
+    jobs_by_url = {job.job_url: job for job in db.query(Job).filter(Job.job_url.in_(job_urls))}
+    return [jobs_by_url[url] for url in job_urls]
 
 # Database dependency
 def get_db():
@@ -94,3 +163,13 @@ def get_db():
 # Create tables
 def create_tables():
     Base.metadata.create_all(bind=engine)
+    
+    # create_all skips tables that already exist, so add any indexes they are missing.
+    # A unique index cannot be built over duplicate rows left by older versions;
+    # those are logged and skipped rather than stopping the app from starting.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except IntegrityError as e:
+                logger.warning("⚠️ Skipping index %s, %s has duplicate rows: %s", index.name, table.name, e.orig)
@@ -1,15 +1,62 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder
 import uvicorn
 import os
+import queue
+import atexit
+import logging
+import logging.handlers
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Route handlers only enqueue log records; a background listener thread
+# formats and writes them, so logging never blocks a request on stderr
+log_queue = queue.SimpleQueue()
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+log_listener = logging.handlers.QueueListener(log_queue, log_handler)
+root_logger = logging.getLogger()
+root_logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener.start()
+atexit.register(log_listener.stop)
+
 # Import routes
 from routes import resumes, jobs, ai, export
+from database import create_tables
+
+class EventStreamAwareGZipResponder(GZipResponder):
+    """GZip responder that passes server-sent event responses through uncompressed so each event is flushed"""
+    
+    passthrough = False
+    
+    async def send_with_gzip(self, message):
+        # Decided from the response's content type, so a client that asks for
+        # ?stream=true without an event-stream Accept header is covered too
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            self.passthrough = content_type.startswith("text/event-stream")
+        if self.passthrough:
+            await self.send(message)
+            return
+        await super().send_with_gzip(message)
+
+class EventStreamAwareGZipMiddleware(GZipMiddleware):
+    """GZip middleware that leaves server-sent event streams uncompressed"""
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("accept-encoding", ""):
+            responder = EventStreamAwareGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
 
 # Create FastAPI app
 app = FastAPI(
@@ -17,7 +64,8 @@ app = FastAPI(
     description="AI-powered recruitment SaaS platform for resume parsing, job scraping, and document generation",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse  # orjson serializes responses several times faster than json
 )
 
 # Configure CORS
@@ -29,12 +77,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses such as job listings and generated documents
+app.add_middleware(EventStreamAwareGZipMiddleware, minimum_size=1024, compresslevel=4)
+
 # Include routers
 app.include_router(resumes.router, prefix="/api/resumes", tags=["resumes"])
 app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
 app.include_router(ai.router, prefix="/api/ai", tags=["ai"])
 app.include_router(export.router, prefix="/api", tags=["export"])
 
+@app.on_event("startup")
+def startup():
+    """Create missing tables and indexes before serving requests"""
+    create_tables()
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -42,6 +42,8 @@ class JobResponse(BaseModel):
     source: Optional[str] = None
     posted_date: Optional[datetime] = None
 
+    model_config = ConfigDict(from_attributes=True)
+
 class JobSearchResponse(BaseModel):
     jobs: List[JobResponse]
     total_count: int
@@ -95,5 +97,4 @@ class CandidateResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,225 +1,502 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from database import get_db, GeneratedDocument, Candidate, Job
+from config import Settings, get_settings
 from models import AIGenerationRequest, AIGenerationResponse
-from openai import AzureOpenAI
-import os
+import asyncio
+import re
 import json
+import orjson
+import hashlib
+import textwrap
+import threading
+import logging
+import time
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
+from string import Template
+from typing import AsyncIterator, List, Optional, Tuple
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Generated documents keyed by a hash of the full completion request, so
+# regenerating the same resume/cover letter for the same job skips the Azure
+# OpenAI round-trip. Entries expire after a day; hits and misses are reported
+# by /health.
+GENERATION_CACHE_SIZE = 256
+GENERATION_CACHE_TTL_SECONDS = 24 * 60 * 60
+_generation_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_generation_cache_stats = {"hits": 0, "misses": 0}
+_generation_cache_lock = threading.Lock()
+
+def get_generation_cache_key(model: Optional[str], messages: List[dict], options: dict) -> str:
+    """Build a stable hash of the deployment, chat messages and sampling options sent for a generation"""
+    payload = orjson.dumps({"model": model, "messages": messages, **options}, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+# Completion budgets sized to the documents (a resume of at most two pages, a
+# one-page cover letter) with headroom, rather than a flat 4000 tokens
+RESUME_MAX_TOKENS = 2200
+COVER_LETTER_MAX_TOKENS = 1000
+
+# Stop at the trailing notes the prompts tell the model not to add, so it does
+# not spend output tokens on them. A "---" rule is not a stop: the model may put
+# one between sections, and stopping there would return half a document.
+RESUME_STOP_SEQUENCES = ["\n\nNote:", "\n\nThe resume has been"]
+COVER_LETTER_STOP_SEQUENCES = ["\n\nNote:"]
+
+# Job descriptions shorter than this give the model nothing to tailor to; longer
+# ones are truncated (roughly 3000 tokens) so one posting cannot crowd the prompt
+JOB_DESCRIPTION_MIN_CHARS = 30
+JOB_DESCRIPTION_MAX_CHARS = 12000
+
+# Bound on the per-request user message (mostly the resume and job description),
+# estimated at about 4 characters per token; larger requests are rejected before
+# calling Azure
+PROMPT_INPUT_MAX_TOKENS = 6000
+CHARS_PER_TOKEN = 4
+
+# Resume sections the prompt templates draw on; anything else in the posted data
+# (ids, status messages) is dropped before serialization
+PROMPT_RESUME_SECTIONS = (
+    'name', 'contact_info', 'summary', 'skills', 'experience', 'education', 'projects',
+    'certifications', 'extracurricular', 'awards', 'volunteer', 'languages', 'interests'
+)
+PROMPT_ENTRY_MAX_CHARS = 400
+
+def shorten_entry(entry):
+    """Shorten long text in a resume entry so one field cannot dominate the prompt"""
+    if isinstance(entry, str) and len(entry) > PROMPT_ENTRY_MAX_CHARS:
+        return textwrap.shorten(entry, PROMPT_ENTRY_MAX_CHARS, placeholder='...')
+    if isinstance(entry, dict):
+        return {key: shorten_entry(value) for key, value in entry.items()}
+    return entry
+
+def slim_resume_for_prompt(resume_data: dict) -> dict:
+    """Keep only the non-empty resume sections the prompts use, with long entries shortened and duplicates dropped"""
+    # The frontend posts the whole upload response, which nests the parsed resume
+    if isinstance(resume_data.get('resume_data'), dict):
+        resume_data = resume_data['resume_data']
+    
+    slim_data = {}
+    for section in PROMPT_RESUME_SECTIONS:
+        value = resume_data.get(section)
+        if not value:
+            continue
+        if isinstance(value, list):
+            # The parser's pattern matches can run on to the next period, so on a
+            # bullet-style resume several entries hold the same long stretch of text
+            entries = []
+            for entry in value:
+                entry = shorten_entry(entry)
+                if entry not in entries:
+                    entries.append(entry)
+            value = entries
+        slim_data[section] = value
+    return slim_data
+
+BLANK_LINES_PATTERN = re.compile(r'\n{3,}')
+
+def compact_prompt(prompt: str) -> str:
+    """Strip per-line indentation and collapse runs of blank lines, which only cost prompt tokens"""
+    lines = [line.strip() for line in prompt.strip().splitlines()]
+    return BLANK_LINES_PATTERN.sub('\n\n', '\n'.join(lines))
+
+# Prompt text that never varies between requests. Keeping it byte-identical and
+# ahead of the per-request inputs lets Azure OpenAI reuse the cached prefix.
+SYSTEM_PROMPT = "You are an expert career coach and professional resume writer. You specialize in creating compelling, tailored resumes and cover letters that get candidates hired. CRITICAL: Use ONLY the candidate's actual information provided. Do NOT create fake companies, fake experience, fake achievements, or fake details. If information is missing, simply omit that section. Focus on tailoring the existing real information to match the job requirements. NEVER use asterisk (*) symbols in resumes - use only bullet points (•)."
+
+RESUME_INSTRUCTIONS = compact_prompt("""
+You are a professional resume writer.
+Generate a clean, modern, ATS-friendly resume for the candidate described under INPUTS, applying for the role at the company given there.
+
+STRICT RULES:
+- Use ONLY candidate's actual information. No fake companies, roles, or achievements.
+- If a section has no data, OMIT it completely. Do not create empty sections.
+- Use only explicitly listed skills, tools, or experiences. Do not invent.
+- Tailor wording to match the target role at the target company by aligning with the job description keywords.
+- Do NOT include location or address unless specifically provided.
+- CRITICAL: Do NOT use asterisk (*) symbols anywhere in the resume - use only bullet points (•).
+- Do NOT use "|" symbols in project names or anywhere in the resume.
+- Output only the final resume. No extra notes, explanations, or markdown.
+
+RESUME BLUEPRINT TEMPLATE:
+
+[CANDIDATE NAME IN UPPERCASE, omitted if no candidate is given under INPUTS]
+[Contact line exactly as given under INPUTS, omitted if none is given]
+
+PROFESSIONAL SUMMARY
+[Write 2-3 lines highlighting experience, top skills, and career goals tailored to the target role at the target company. Focus on skills and experience that directly match the job requirements. Use metrics if available. Emphasize relevant achievements that align with the job description.]
+
+WORK EXPERIENCE
+[For each real experience found, format as:]
+Job Title | Company | Duration (exactly as in resume data)
+• Achievement #1 (use metrics if possible, emphasize skills relevant to the target role)
+• Achievement #2 (highlight experience that matches job requirements)
+• Achievement #3 (focus on results that demonstrate value for the target company)
+
+[Repeat for multiple roles, in reverse chronological order. Prioritize experiences most relevant to the target role.]
+
+EDUCATION
+[Only if present in resume data, format as:]
+Degree | University | Graduation Year
+
+SKILLS
+[Format as comma-separated list, NOT bullet points. Group by category if multiple categories exist. Prioritize skills mentioned in the job description:]
+Programming Languages: [list from resume data, emphasize those mentioned in job description and all from resume data]
+Frameworks & Libraries: [list from resume data, highlight relevant frameworks for the target role]
+Tools & Technologies: [list from resume data, focus on tools relevant to the target company]
+Databases: [list from resume data]
+Other Skills: [list from resume data, emphasize soft skills relevant to the role]
+
+PROJECTS
+[Only if present in resume data, format as. Prioritize projects most relevant to the target role:]
+Project Name
+• Description of what was built/accomplished (emphasize technologies/skills relevant to job)
+• Key feature or measurable outcome (highlight results that demonstrate value)
+
+CERTIFICATIONS
+[Only if present in resume data, format as:]
+Certification Name | Issuing Organization | Date
+
+EXTRACURRICULAR ACTIVITIES
+[Only if present in resume data, format as:]
+Activity/Role | Organization | Duration
+• Key achievement or responsibility
+
+AWARDS & ACHIEVEMENTS
+[Only if present in resume data, format as:]
+Award Name | Organization | Date
+• Brief description of achievement
+
+VOLUNTEER / LEADERSHIP ROLES
+[Only if present in resume data, format as:]
+Role | Organization | Duration
+• Key responsibility or achievement
+
+LANGUAGES
+[Only if present in resume data, format as:]
+Language: Proficiency Level
+
+INTERESTS
+[Only if present in resume data, format as comma-separated list]
+
+FORMATTING REQUIREMENTS:
+- Left align all text
+- Use consistent bullet points (•) ONLY - NEVER use asterisk (*) symbols
+- Maintain clear spacing between sections
+- Ensure ATS compatibility with standard section headers
+- 1 page if under 10 years experience, max 2 pages
+- Clean fonts, bullets, and whitespace
+- No photos or personal info beyond contact details
+- Must be ATS-friendly (no tables, graphics, or complex formatting)
+""")
+
+COVER_LETTER_INSTRUCTIONS = compact_prompt("""
+You are a professional career coach and resume writer.
+Generate a clean, professional cover letter for the candidate described under INPUTS, applying for the role at the company given there.
+
+STRICT RULES:
+- Use ONLY candidate's real information. No fake experience, projects, or achievements.
+- If a section of information is missing, skip it completely.
+- Do NOT invent company values or mission statements. Use only details in the JD.
+- Be specific: use keywords from the JD that match the candidate's actual skills.
+- Do not repeat the resume content verbatim; rewrite it as a persuasive narrative.
+- Output ONLY the cover letter in plain text, no markdown, no extra notes.
+- Keep cover letter 3-4 short paragraphs, one page max.
+- Tone: Professional, confident, and tailored to the job.
+- Must be ATS-friendly (plain text, no special formatting).
+
+COVER LETTER BLUEPRINT TEMPLATE:
+
+[Candidate name, omitted if none is given under INPUTS]
+[Contact line exactly as given under INPUTS, omitted if none is given]
+
+[Date given under INPUTS]
+
+[Target company]
+Human Resources Department
+
+Dear Hiring Manager,
+
+[Opening Paragraph: Express genuine enthusiasm for the specific target role at the target company. Mention specific aspects of the company or role that attracted the candidate. Reference the job posting or company values that align with the candidate's career goals. Keep it concise and engaging.]
+
+[Body Paragraph 1 - Relevant Experience: Highlight the most relevant work experience or achievements tailored to the target role. Use measurable results where possible. Focus on 1-2 key accomplishments that directly relate to the job requirements. Emphasize how past experience has prepared the candidate for this specific role.]
+
+[Body Paragraph 2 - Skills & Value Add: Show how candidate's skills and qualifications directly match the job requirements. Mention key technical or soft skills from the resume that align with the job description. Explain how these skills will benefit the target company and contribute to their success. Reference specific technologies or methodologies mentioned in the job description.]
+
+[Closing Paragraph: Reaffirm excitement for the role and what the candidate can contribute to the target company. Mention specific ways the candidate can add value to the team. Express availability for interview and thank the hiring manager for consideration. Keep it professional, confident, and forward-looking.]
+
+Sincerely,
+[Candidate name]
+""")
+
+# Full system message per content type: every request of a type starts with the
+# same bytes, so Azure OpenAI can serve that prefix from its prompt cache
+RESUME_SYSTEM_PROMPT = f"{SYSTEM_PROMPT}\n\n{RESUME_INSTRUCTIONS}"
+COVER_LETTER_SYSTEM_PROMPT = f"{SYSTEM_PROMPT}\n\n{COVER_LETTER_INSTRUCTIONS}"
+
+# Per-request user message, parsed once at import and filled in with a single
+# substitute() call per request; $candidate_lines holds the Candidate and
+# Contact line lines, each left out when the resume has no value for it
+RESUME_INPUTS_TEMPLATE = Template("""INPUTS:
+${candidate_lines}Role: $job_title
+Company: $company_name
+
+CANDIDATE INFO (from resume):
+$resume_data
+
+JOB DESCRIPTION:
+$job_description""")
+COVER_LETTER_INPUTS_TEMPLATE = Template("""INPUTS:
+${candidate_lines}Date: $current_date
+Role: $job_title
+Company: $company_name
+
+CANDIDATE INFO (from resume):
+$resume_data
+
+JOB DESCRIPTION:
+$job_description""")
+
+# Fail fast on an unreachable endpoint and bound a stalled completion, instead
+# of the SDK's 10 minute default; transient errors are retried twice
+AZURE_OPENAI_TIMEOUT_SECONDS = 60.0
+AZURE_OPENAI_CONNECT_TIMEOUT_SECONDS = 5.0
+AZURE_OPENAI_MAX_RETRIES = 2
+
+# Connection pool for the Azure OpenAI client; HTTP/2 lets concurrent
+# generations share one TLS connection instead of opening one each
+AZURE_OPENAI_MAX_CONNECTIONS = 100
+AZURE_OPENAI_MAX_KEEPALIVE_CONNECTIONS = 20
+
+# Cap on concurrent Azure OpenAI calls per process; a burst of requests queues
+# here instead of exceeding the deployment's rate limit and retrying on 429s
+_azure_semaphore = asyncio.Semaphore(get_settings().azure_openai_max_concurrency)
 
+@lru_cache(maxsize=1)
 def get_azure_client():
-    """Get Azure OpenAI client"""
-    return AzureOpenAI(
-        api_key=os.getenv('AZURE_OPENAI_API_KEY'),
-        api_version=os.getenv('AZURE_OPENAI_API_VERSION', '2023-07-01-preview'),
-        azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT')
+    """Get async Azure OpenAI client (built once and reused so its connection pool stays warm)"""
+    import httpx
+    from openai import AsyncAzureOpenAI
+    
+    settings = get_settings()
+    timeout = httpx.Timeout(AZURE_OPENAI_TIMEOUT_SECONDS, connect=AZURE_OPENAI_CONNECT_TIMEOUT_SECONDS)
+    return AsyncAzureOpenAI(
+        api_key=settings.azure_openai_api_key,
+        api_version=settings.azure_openai_api_version,
+        azure_endpoint=settings.azure_openai_endpoint,
+        timeout=timeout,
+        max_retries=AZURE_OPENAI_MAX_RETRIES,
+        http_client=httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=AZURE_OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=AZURE_OPENAI_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            timeout=timeout
+        )
     )
 
-def generate_ai_content_with_job_details(resume_data: dict, job_description: str, job_title: str, company_name: str, content_type: str) -> str:
-    """Generate tailored resume or cover letter using Azure OpenAI with specific job details"""
+def build_generation_request(resume_data: dict, job_description: str, job_title: str, company_name: str, content_type: str) -> Tuple[str, List[dict]]:
+    """Build the cache key and chat messages for a resume or cover letter generation from slimmed resume data"""
+    # Serialize the resume data compactly: indentation, empty sections and
+    # \uXXXX escapes of non-ASCII text only add prompt tokens. orjson emits
+    # compact UTF-8 by default and is several times faster than json. The name
+    # and contact details have their own INPUTS lines, so the JSON omits them.
+    resume_data_cleaned = orjson.dumps(
+        {section: value for section, value in resume_data.items() if section not in ('name', 'contact_info')},
+        option=orjson.OPT_SORT_KEYS
+    ).decode('utf-8')
+    
+    # Get candidate details; only fields the resume actually has are passed on,
+    # so the model is never handed placeholder contact details to copy
+    contact_info = resume_data.get('contact_info') or {}
+    contact_fields = ['phone', 'email', 'linkedin']
+    if content_type == "resume":
+        contact_fields.append('website')
+    contact_line = ' | '.join(contact_info[field] for field in contact_fields if contact_info.get(field))
+    candidate_lines = ''.join(
+        f"{label}: {value}\n"
+        for label, value in (('Candidate', resume_data.get('name')), ('Contact line', contact_line))
+        if value
+    )
+    
+    # The user message carries only the per-request inputs; the instructions
+    # live in the constant system message ahead of it
+    if content_type == "resume":
+        system_prompt = RESUME_SYSTEM_PROMPT
+        prompt = RESUME_INPUTS_TEMPLATE.substitute(
+            candidate_lines=candidate_lines,
+            job_title=job_title,
+            company_name=company_name,
+            resume_data=resume_data_cleaned,
+            job_description=job_description
+        )
+    else:  # cover letter
+        system_prompt = COVER_LETTER_SYSTEM_PROMPT
+        prompt = COVER_LETTER_INPUTS_TEMPLATE.substitute(
+            candidate_lines=candidate_lines,
+            current_date=datetime.now().strftime("%B %d, %Y"),
+            job_title=job_title,
+            company_name=company_name,
+            resume_data=resume_data_cleaned,
+            job_description=job_description
+        )
+    
+    prompt = compact_prompt(prompt)
+    logger.debug("Prompt length: %d", len(prompt))
+    
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt}
+    ]
+    cache_key = get_generation_cache_key(
+        get_settings().azure_openai_deployment_name,
+        messages,
+        get_completion_options(content_type)
+    )
+    return cache_key, messages
+
+def get_completion_options(content_type: str) -> dict:
+    """Output budget, stop sequences and temperature for a content type"""
+    if content_type == "resume":
+        return {"max_tokens": RESUME_MAX_TOKENS, "stop": RESUME_STOP_SEQUENCES, "temperature": 0.2}
+    return {"max_tokens": COVER_LETTER_MAX_TOKENS, "stop": COVER_LETTER_STOP_SEQUENCES, "temperature": 0.2}
+
+def get_cached_generation(cache_key: str) -> Optional[str]:
+    """Return previously generated content for a cache key, if any and not expired"""
+    with _generation_cache_lock:
+        cached = _generation_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] >= GENERATION_CACHE_TTL_SECONDS:
+            del _generation_cache[cache_key]
+            cached = None
+        if cached is None:
+            _generation_cache_stats["misses"] += 1
+            return None
+        _generation_cache_stats["hits"] += 1
+        _generation_cache.move_to_end(cache_key)
+    return cached[1]
+
+def cache_generation(cache_key: str, content: str):
+    """Remember generated content, evicting the least recently used entry"""
+    with _generation_cache_lock:
+        _generation_cache[cache_key] = (time.monotonic(), content)
+        _generation_cache.move_to_end(cache_key)
+        if len(_generation_cache) > GENERATION_CACHE_SIZE:
+            _generation_cache.popitem(last=False)
+
+def get_generation_cache_stats() -> dict:
+    """Snapshot of the generation cache's size and hit/miss counts"""
+    with _generation_cache_lock:
+        return {"size": len(_generation_cache), **_generation_cache_stats}
+
+async def generate_ai_content_with_job_details(cache_key: str, messages: List[dict], content_type: str) -> str:
+    """Generate tailored resume or cover letter using Azure OpenAI from a built generation request"""
     try:
-        print(f"🔍 Generating {content_type} for {job_title} at {company_name}")
-        print(f"Resume data keys: {list(resume_data.keys()) if resume_data else 'None'}")
+        cached_content = get_cached_generation(cache_key)
+        if cached_content is not None:
+            logger.info("♻️ Returning cached %s", content_type)
+            return cached_content
         
         client = get_azure_client()
         
-        # Get candidate details
-        candidate_name = resume_data.get('name', 'Candidate')
-        candidate_email = resume_data.get('contact_info', {}).get('email', 'candidate@email.com')
-        candidate_phone = resume_data.get('contact_info', {}).get('phone', 'Phone Number')
-        candidate_linkedin = resume_data.get('contact_info', {}).get('linkedin', 'LinkedIn Profile')
-        
-        if content_type == "resume":
-            # Clean the resume data for better formatting
-            resume_data_cleaned = json.dumps(resume_data, indent=2)
-            
-            prompt = f"""
-            You are a professional resume writer. 
-            Generate a clean, modern, ATS-friendly resume for {candidate_name} applying for the role of {job_title} at {company_name}.
-
-            CANDIDATE INFO (from resume):
-            {resume_data_cleaned}
-
-            JOB DESCRIPTION:
-            {job_description}
-
-            STRICT RULES:
-            - Use ONLY candidate's actual information. No fake companies, roles, or achievements.
-            - If a section has no data, OMIT it completely. Do not create empty sections.
-            - Use only explicitly listed skills, tools, or experiences. Do not invent.
-            - Tailor wording to match {job_title} at {company_name} by aligning with the job description keywords.
-            - Do NOT include location or address unless specifically provided.
-            - CRITICAL: Do NOT use asterisk (*) symbols anywhere in the resume - use only bullet points (•).
-            - Do NOT use "|" symbols in project names or anywhere in the resume.
-            - Output only the final resume. No extra notes, explanations, or markdown.
-
-            RESUME BLUEPRINT TEMPLATE:
-
-            {candidate_name.upper()}
-            {candidate_phone} | {candidate_email}{' | ' + resume_data.get('contact_info', {}).get('linkedin', '') if resume_data.get('contact_info', {}).get('linkedin') else ''}{' | ' + resume_data.get('contact_info', {}).get('website', '') if resume_data.get('contact_info', {}).get('website') else ''}
-
-            PROFESSIONAL SUMMARY
-            [Write 2-3 lines highlighting experience, top skills, and career goals tailored to {job_title} at {company_name}. Focus on skills and experience that directly match the job requirements. Use metrics if available. Emphasize relevant achievements that align with the job description.]
-
-            WORK EXPERIENCE
-            [For each real experience found, format as:]
-            Job Title | Company | Duration (exactly as in resume data)
-            • Achievement #1 (use metrics if possible, emphasize skills relevant to {job_title})
-            • Achievement #2 (highlight experience that matches job requirements)
-            • Achievement #3 (focus on results that demonstrate value for {company_name})
-
-            [Repeat for multiple roles, in reverse chronological order. Prioritize experiences most relevant to {job_title}.]
-
-            EDUCATION
-            [Only if present in resume data, format as:]
-            Degree | University | Graduation Year
-
-            SKILLS
-            [Format as comma-separated list, NOT bullet points. Group by category if multiple categories exist. Prioritize skills mentioned in the job description:]
-            Programming Languages: [list from resume data, emphasize those mentioned in job description and all from resume data]
-            Frameworks & Libraries: [list from resume data, highlight relevant frameworks for {job_title}]
-            Tools & Technologies: [list from resume data, focus on tools relevant to {company_name}]
-            Databases: [list from resume data]
-            Other Skills: [list from resume data, emphasize soft skills relevant to the role]
-
-            PROJECTS
-            [Only if present in resume data, format as. Prioritize projects most relevant to {job_title}:]
-            Project Name
-            • Description of what was built/accomplished (emphasize technologies/skills relevant to job)
-            • Key feature or measurable outcome (highlight results that demonstrate value)
-
-            CERTIFICATIONS
-            [Only if present in resume data, format as:]
-            Certification Name | Issuing Organization | Date
-
-            EXTRACURRICULAR ACTIVITIES
-            [Only if present in resume data, format as:]
-            Activity/Role | Organization | Duration
-            • Key achievement or responsibility
-
-            AWARDS & ACHIEVEMENTS
-            [Only if present in resume data, format as:]
-            Award Name | Organization | Date
-            • Brief description of achievement
-
-            VOLUNTEER / LEADERSHIP ROLES
-            [Only if present in resume data, format as:]
-            Role | Organization | Duration
-            • Key responsibility or achievement
-
-            LANGUAGES
-            [Only if present in resume data, format as:]
-            Language: Proficiency Level
-
-            INTERESTS
-            [Only if present in resume data, format as comma-separated list]
-
-            FORMATTING REQUIREMENTS:
-            - Left align all text
-            - Use consistent bullet points (•) ONLY - NEVER use asterisk (*) symbols
-            - Maintain clear spacing between sections
-            - Ensure ATS compatibility with standard section headers
-            - 1 page if under 10 years experience, max 2 pages
-            - Clean fonts, bullets, and whitespace
-            - No photos or personal info beyond contact details
-            - Must be ATS-friendly (no tables, graphics, or complex formatting)
-            - CRITICAL: Do NOT use asterisk (*) symbols anywhere in the resume - use only bullet points (•)
-            - Do NOT use "|" symbols in project names or anywhere in the resume
-            - FONT SIZES: Name should be 14pt, section headers should be 10pt, body text should be 9pt
-            """
-        else:  # cover letter
-            current_date = datetime.now().strftime("%B %d, %Y")
-            
-            # Clean the resume data for better formatting
-            resume_data_cleaned = json.dumps(resume_data, indent=2)
-            
-            prompt = f"""
-            You are a professional career coach and resume writer. 
-            Generate a clean, professional cover letter for {candidate_name}, applying for the role of {job_title} at {company_name}.
-
-            CANDIDATE INFO (from resume):
-            {resume_data_cleaned}
-
-            JOB DESCRIPTION:
-            {job_description}
-
-            STRICT RULES:
-            - Use ONLY candidate's real information. No fake experience, projects, or achievements.
-            - If a section of information is missing, skip it completely.
-            - Do NOT invent company values or mission statements. Use only details in the JD.
-            - Be specific: use keywords from the JD that match the candidate's actual skills.
-            - Do not repeat the resume content verbatim; rewrite it as a persuasive narrative.
-            - Output ONLY the cover letter in plain text, no markdown, no extra notes.
-            - Keep cover letter 3-4 short paragraphs, one page max.
-            - Tone: Professional, confident, and tailored to the job.
-            - Must be ATS-friendly (plain text, no special formatting).
-            - FONT SIZES: Name should be 12pt, body text should be 10pt, keep headings minimal
-
-            COVER LETTER BLUEPRINT TEMPLATE:
-
-            {candidate_name}
-            {candidate_phone} | {candidate_email}{' | ' + resume_data.get('contact_info', {}).get('linkedin', '') if resume_data.get('contact_info', {}).get('linkedin') else ''}
-
-            {current_date}
-
-            {company_name}
-            Human Resources Department
-
-            Dear Hiring Manager,
-
-            [Opening Paragraph: Express genuine enthusiasm for the specific {job_title} position at {company_name}. Mention specific aspects of the company or role that attracted the candidate. Reference the job posting or company values that align with the candidate's career goals. Keep it concise and engaging.]
-
-            [Body Paragraph 1 - Relevant Experience: Highlight the most relevant work experience or achievements tailored to the {job_title} role. Use measurable results where possible. Focus on 1-2 key accomplishments that directly relate to the job requirements. Emphasize how past experience has prepared the candidate for this specific role.]
-
-            [Body Paragraph 2 - Skills & Value Add: Show how candidate's skills and qualifications directly match the job requirements. Mention key technical or soft skills from the resume that align with the job description. Explain how these skills will benefit {company_name} and contribute to their success. Reference specific technologies or methodologies mentioned in the job description.]
-
-            [Closing Paragraph: Reaffirm excitement for the role and what the candidate can contribute to {company_name}. Mention specific ways the candidate can add value to the team. Express availability for interview and thank the hiring manager for consideration. Keep it professional, confident, and forward-looking.]
-
-            Sincerely,
-            {candidate_name}
-            """
+        deployment_name = get_settings().azure_openai_deployment_name
+        logger.debug("📝 Sending request to Azure OpenAI deployment %s", deployment_name)
         
-        print(f"📝 Sending request to Azure OpenAI...")
-        print(f"Model: {os.getenv('AZURE_OPENAI_DEPLOYMENT_NAME')}")
-        print(f"Prompt length: {len(prompt)}")
+        async with _azure_semaphore:
+            response = await client.chat.completions.create(
+                model=deployment_name,
+                messages=messages,
+                **get_completion_options(content_type)
+            )
         
-        response = client.chat.completions.create(
-            model=os.getenv('AZURE_OPENAI_DEPLOYMENT_NAME'),
-            messages=[
-                {"role": "system", "content": "You are an expert career coach and professional resume writer. You specialize in creating compelling, tailored resumes and cover letters that get candidates hired. CRITICAL: Use ONLY the candidate's actual information provided. Do NOT create fake companies, fake experience, fake achievements, or fake details. If information is missing, simply omit that section. Focus on tailoring the existing real information to match the job requirements. NEVER use asterisk (*) symbols in resumes - use only bullet points (•)."},
-                
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=4000,
-            temperature=0.2
-        )
+        content = response.choices[0].message.content
+        finish_reason = response.choices[0].finish_reason
+        logger.info("✅ Received %d characters from Azure OpenAI", len(content or ""))
+        if response.usage:
+            # Cached prompt tokens show whether the constant system message hit the prompt cache
+            prompt_tokens_details = getattr(response.usage, 'prompt_tokens_details', None)
+            cached_tokens = getattr(prompt_tokens_details, 'cached_tokens', None) or 0
+            logger.info(
+                "Tokens: %d prompt (%d cached), %d completion",
+                response.usage.prompt_tokens, cached_tokens, response.usage.completion_tokens
+            )
         
-        print(f"✅ Received response from Azure OpenAI")
-        print(f"Response length: {len(response.choices[0].message.content)}")
+        # A completion cut off at max_tokens is still returned, but not cached as
+        # if it were the finished document
+        if finish_reason == "length":
+            logger.warning("⚠️ %s hit the output token limit; not caching the truncated text", content_type)
+        elif content:
+            cache_generation(cache_key, content)
         
-        return response.choices[0].message.content
+        return content
         
     except Exception as e:
-        print(f"Error generating {content_type}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error generating %s: %s", content_type, e)
         return ""
 
+async def stream_ai_content_with_job_details(cache_key: str, messages: List[dict], content_type: str) -> AsyncIterator[str]:
+    """Yield a tailored resume or cover letter from Azure OpenAI as it is generated from a built generation request"""
+    cached_content = get_cached_generation(cache_key)
+    if cached_content is not None:
+        logger.info("♻️ Returning cached %s", content_type)
+        yield cached_content
+        return
+    
+    client = get_azure_client()
+    
+    logger.debug("📝 Streaming request to Azure OpenAI")
+    parts = []
+    finish_reason = None
+    # The slot is held until the stream ends, since Azure is generating throughout
+    async with _azure_semaphore:
+        response = await client.chat.completions.create(
+            model=get_settings().azure_openai_deployment_name,
+            messages=messages,
+            stream=True,
+            **get_completion_options(content_type)
+        )
+        
+        async for chunk in response:
+            # Azure sends chunks without choices (e.g. content filter results)
+            if not chunk.choices:
+                continue
+            # The final chunk carries the finish reason and no content
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+            if not chunk.choices[0].delta.content:
+                continue
+            parts.append(chunk.choices[0].delta.content)
+            yield chunk.choices[0].delta.content
+    
+    content = "".join(parts)
+    logger.info("✅ Streamed %d characters from Azure OpenAI", len(content))
+    if finish_reason == "length":
+        logger.warning("⚠️ %s hit the output token limit; not caching the truncated text", content_type)
+    elif content:
+        cache_generation(cache_key, content)
+
+async def format_sse_events(content_chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Wrap generated text as server-sent events, ending with a done or error event"""
+    try:
+        async for content_chunk in content_chunks:
+            yield f"data: {json.dumps({'content': content_chunk})}\n\n"
+    except Exception as e:
+        logger.exception("Error streaming content: %s", e)
+        yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        return
+    yield "event: done\ndata: {}\n\n"
+
 @router.post("/generate", response_model=AIGenerationResponse)
-async def generate_content(request: dict, db: Session = Depends(get_db)):
-    """Generate AI-powered resume or cover letter"""
+async def generate_content(request: dict, stream: bool = False, db: Session = Depends(get_db), settings: Settings = Depends(get_settings)):
+    """Generate AI-powered resume or cover letter, optionally streamed as server-sent events"""
     
     try:
         # Validate required environment variables
-        required_vars = [
-            'AZURE_OPENAI_API_KEY',
-            'AZURE_OPENAI_ENDPOINT',
-            'AZURE_OPENAI_DEPLOYMENT_NAME'
-        ]
-        
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
+        missing_vars = settings.missing_azure_vars
         if missing_vars:
             raise HTTPException(
                 status_code=500, 
@@ -227,23 +504,60 @@ async def generate_content(request: dict, db: Session = Depends(get_db)):
             )
         
         # Extract data from request
-        resume_data = request.get('resume_data', {})
-        job_description = request.get('job_description', '')
-        job_title = request.get('job_title', '')
-        company_name = request.get('company_name', '')
-        content_type = request.get('contentType', 'resume')
+        # JSON nulls fall back to the defaults like missing fields do
+        resume_data = request.get('resume_data') or {}
+        job_description = request.get('job_description') or ''
+        job_title = request.get('job_title') or ''
+        company_name = request.get('company_name') or ''
+        content_type = request.get('contentType') or 'resume'
         
-        # Generate content using existing function
-        content = generate_ai_content_with_job_details(
-            resume_data,
+        # Reject requests the model cannot do anything useful with before paying
+        # for a round-trip, and bound the job description's share of the prompt
+        if not resume_data:
+            raise HTTPException(status_code=400, detail="Resume data is required")
+        if not isinstance(resume_data, dict):
+            raise HTTPException(status_code=400, detail="Resume data must be an object")
+        if not isinstance(job_description, str):
+            raise HTTPException(status_code=400, detail="Job description must be a string")
+        if len(job_description.strip()) < JOB_DESCRIPTION_MIN_CHARS:
+            raise HTTPException(status_code=400, detail="Job description is missing or too short")
+        if len(job_description) > JOB_DESCRIPTION_MAX_CHARS:
+            logger.warning("⚠️ Truncating job description from %d to %d characters", len(job_description), JOB_DESCRIPTION_MAX_CHARS)
+            job_description = job_description[:JOB_DESCRIPTION_MAX_CHARS]
+        
+        # Slim and serialize the resume once; the size check measures the same
+        # user message that is sent to Azure
+        logger.info("🔍 Generating %s for %s at %s", content_type, job_title, company_name)
+        cache_key, messages = build_generation_request(
+            slim_resume_for_prompt(resume_data),
             job_description,
             job_title,
             company_name,
             content_type
         )
+        input_tokens = len(messages[-1]["content"]) // CHARS_PER_TOKEN
+        if input_tokens > PROMPT_INPUT_MAX_TOKENS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Resume and job description are too long (about {input_tokens} tokens, limit {PROMPT_INPUT_MAX_TOKENS})"
+            )
+        
+        # Stream the content as it is generated so the UI can show it after the
+        # first tokens rather than after the whole completion
+        if stream:
+            content_chunks = stream_ai_content_with_job_details(cache_key, messages, content_type)
+            return StreamingResponse(
+                format_sse_events(content_chunks),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+        
+        # The async client awaits Azure without holding the event loop, so
+        # concurrent generations (e.g. resume and cover letter) overlap
+        content = await generate_ai_content_with_job_details(cache_key, messages, content_type)
         
         if not content:
-            print("No content generated - this might be due to Azure OpenAI issues")
+            logger.error("No content generated - this might be due to Azure OpenAI issues")
             raise HTTPException(status_code=500, detail="Failed to generate content - check Azure OpenAI configuration")
         
         # Save to database (optional - you might want to implement this)
@@ -261,17 +575,11 @@ async def generate_content(request: dict, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/health")
-async def ai_health_check():
+async def ai_health_check(settings: Settings = Depends(get_settings)):
     """Health check for AI service"""
     try:
         # Check if Azure OpenAI is configured
-        required_vars = [
-            'AZURE_OPENAI_API_KEY',
-            'AZURE_OPENAI_ENDPOINT',
-            'AZURE_OPENAI_DEPLOYMENT_NAME'
-        ]
-        
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
+        missing_vars = settings.missing_azure_vars
         if missing_vars:
             return {
                 "status": "unhealthy",
@@ -280,7 +588,8 @@ async def ai_health_check():
         
         return {
             "status": "healthy",
-            "message": "AI service is ready"
+            "message": "AI service is ready",
+            "generation_cache": get_generation_cache_stats()
         }
         
     except Exception as e:
@@ -1,41 +1,234 @@
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from models import ExportRequest
-from docx import Document
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib.colors import black
 import io
 import os
+import re
+import hashlib
+import threading
+from functools import lru_cache
+from collections import OrderedDict
 
 router = APIRouter()
 
+# Built files keyed by (content hash, file type), so exporting the same document
+# again skips rebuilding the DOCX/PDF
+EXPORT_CACHE_SIZE = 16
+_export_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+_export_cache_lock = threading.Lock()
+
+# Precompiled line tests so each line is classified with a few regex searches
+# instead of a Python-level any() scan per keyword
+SECTION_PATTERN = re.compile(
+    r'PROFESSIONAL SUMMARY|WORK EXPERIENCE|EDUCATION|SKILLS|PROJECTS|CERTIFICATIONS|'
+    r'EXTRACURRICULAR ACTIVITIES|AWARDS & ACHIEVEMENTS|VOLUNTEER|LANGUAGES|INTERESTS|'
+    r'TECHNICAL SKILLS|PROFESSIONAL EXPERIENCE'
+)
+MONTH_PATTERN = re.compile(
+    r'January|February|March|April|May|June|July|August|September|October|November|December'
+)
+CONTACT_PATTERN = re.compile(r'@|linkedin\.com|github\.com', re.IGNORECASE)
+DIGIT_PATTERN = re.compile(r'\d')
+NAME_EXCLUDED_PATTERN = re.compile(r'[|@.:•]')
+
+def classify_line(line: str, is_first: bool, in_skills_section: bool, detect_dates: bool = True) -> str:
+    """Classify a line of generated text as name, contact, section, date, job, bullet, skills or text"""
+    # Both the name and section header tests start from an all-caps line
+    is_heading = len(line) > 3 and line.isupper()
+    
+    if is_first or (is_heading and not NAME_EXCLUDED_PATTERN.search(line)):
+        return 'name'
+    if CONTACT_PATTERN.search(line) or (len(line) > 10 and DIGIT_PATTERN.search(line)):
+        return 'contact'
+    if is_heading and SECTION_PATTERN.search(line):
+        return 'section'
+    if detect_dates and len(line.split()) <= 3 and MONTH_PATTERN.search(line):
+        return 'date'
+    if '|' in line:
+        return 'job'
+    if line.startswith(('•', '-')):
+        return 'bullet'
+    if in_skills_section and ':' in line:
+        return 'skills'
+    return 'text'
+
+# Spacer height added after each kind of line in the PDF
+PDF_LINE_SPACING = {'name': 4, 'contact': 8, 'section': 6, 'job': 2}
+
+@lru_cache(maxsize=1)
+def get_pdf_styles() -> dict:
+    """Build the PDF paragraph style for each line kind once and reuse it for every export"""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.colors import black
+    
+    # Custom styles with better formatting
+    styles = getSampleStyleSheet()
+
+    # Name style - smaller, bold, left aligned
+    name_style = ParagraphStyle(
+        'NameStyle',
+        parent=styles['Heading1'],
+        fontSize=14,
+        spaceAfter=10,
+        spaceBefore=0,
+        alignment=0,  # Left align
+        textColor=black,
+        fontName='Helvetica-Bold',
+        leading=16
+    )
+
+    # Contact style - smaller, left aligned
+    contact_style = ParagraphStyle(
+        'ContactStyle',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=20,
+        spaceBefore=0,
+        alignment=0,  # Left align
+        fontName='Helvetica',
+        leading=13
+    )
+
+    # Section header style - smaller, bold, left aligned, perfect spacing
+    section_style = ParagraphStyle(
+        'SectionStyle',
+        parent=styles['Heading2'],
+        fontSize=10,
+        spaceAfter=8,
+        spaceBefore=14,
+        textColor=black,
+        fontName='Helvetica-Bold',
+        alignment=0,  # Left align
+        leftIndent=0,
+        rightIndent=0,
+        leading=12
+    )
+
+    # Job title/company style - bold, perfect spacing
+    job_title_style = ParagraphStyle(
+        'JobTitleStyle',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=6,
+        spaceBefore=0,
+        fontName='Helvetica-Bold',
+        leftIndent=0,
+        rightIndent=0,
+        alignment=0,
+        leading=13
+    )
+
+    # Normal text style - smaller, perfect spacing
+    normal_style = ParagraphStyle(
+        'NormalStyle',
+        parent=styles['Normal'],
+        fontSize=9,
+        spaceAfter=3,
+        spaceBefore=0,
+        fontName='Helvetica',
+        leftIndent=0,
+        rightIndent=0,
+        alignment=0,
+        leading=11
+    )
+
+    # Bullet point style with perfect indentation and spacing
+    bullet_style = ParagraphStyle(
+        'BulletStyle',
+        parent=styles['Normal'],
+        fontSize=9,
+        spaceAfter=2,
+        spaceBefore=0,
+        fontName='Helvetica',
+        leftIndent=20,
+        rightIndent=0,
+        alignment=0,
+        leading=11
+    )
+
+    # Skills style - no bullets, perfect spacing
+    skills_style = ParagraphStyle(
+        'SkillsStyle',
+        parent=styles['Normal'],
+        fontSize=9,
+        spaceAfter=3,
+        spaceBefore=0,
+        fontName='Helvetica',
+        leftIndent=0,
+        rightIndent=0,
+        alignment=0,
+        leading=11
+    )
+
+    # Date style for cover letters - left aligned
+    date_style = ParagraphStyle(
+        'DateStyle',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=15,
+        spaceBefore=0,
+        alignment=0,  # Left align
+        fontName='Helvetica',
+        textColor=black,
+        leading=12
+    )
+
+    return {
+        'name': name_style,
+        'contact': contact_style,
+        'section': section_style,
+        'date': date_style,
+        'job': job_title_style,
+        'bullet': bullet_style,
+        'skills': skills_style,
+        'text': normal_style
+    }
+
 def create_download_file(content: str, filename: str, file_type: str) -> bytes:
-    """Create downloadable file content"""
+    """Create downloadable file content, reusing a previous build of the same content"""
+    cache_key = (hashlib.sha256(content.encode('utf-8')).hexdigest(), file_type)
+    with _export_cache_lock:
+        file_content = _export_cache.get(cache_key)
+        if file_content is not None:
+            _export_cache.move_to_end(cache_key)
+            return file_content
+    
+    file_content = build_download_file(content, file_type)
+    if file_content:
+        with _export_cache_lock:
+            _export_cache[cache_key] = file_content
+            if len(_export_cache) > EXPORT_CACHE_SIZE:
+                _export_cache.popitem(last=False)
+    
+    return file_content
+
+def build_download_file(content: str, file_type: str) -> bytes:
+    """Build a DOCX or PDF from generated text"""
+    # python-docx and ReportLab are imported on first export rather than at
+    # startup, and only the library for the requested format is loaded
     if file_type == "docx":
+        from docx import Document
+        from docx.shared import Pt
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        
         # Create a well-formatted DOCX file
         doc = Document()
         
-        # Set default font
-        from docx.shared import Inches, Pt
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
-        from docx.oxml.shared import OxmlElement, qn
-        
         # Process content with better formatting
-        lines = content.split('\n')
-        i = 0
+        is_first = True
         in_skills_section = False
         
-        while i < len(lines):
-            line = lines[i].strip()
+        for line in content.splitlines():
+            line = line.strip()
             if not line:
-                i += 1
                 continue
             
+            kind = classify_line(line, is_first, in_skills_section, detect_dates=False)
+            is_first = False
+            
             # Check if it's a name (first non-empty line, all caps)
-            if i == 0 or (line.isupper() and len(line) > 3 and not any(char in line for char in ['|', '@', '.', ':', '•'])):
+            if kind == 'name':
                 name_para = doc.add_paragraph()
                 name_para.alignment = WD_ALIGN_PARAGRAPH.LEFT
                 name_run = name_para.add_run(line)
@@ -45,9 +238,7 @@ def create_download_file(content: str, filename: str, file_type: str) -> bytes:
                 doc.add_paragraph()  # Add space after name
             
             # Check if it's contact info
-            elif ('@' in line or 'linkedin.com' in line.lower() or 
-                  (any(char.isdigit() for char in line) and len(line) > 10) or
-                  'github.com' in line.lower()):
+            elif kind == 'contact':
                 contact_para = doc.add_paragraph()
                 contact_para.alignment = WD_ALIGN_PARAGRAPH.LEFT
                 contact_run = contact_para.add_run(line)
@@ -56,13 +247,7 @@ def create_download_file(content: str, filename: str, file_type: str) -> bytes:
                 doc.add_paragraph()  # Add space after contact
             
             # Check if it's a section header
-            elif (line.isupper() and len(line) > 3 and 
-                  any(section in line for section in [
-                      'PROFESSIONAL SUMMARY', 'WORK EXPERIENCE', 'EDUCATION', 
-                      'SKILLS', 'PROJECTS', 'CERTIFICATIONS', 'EXTRACURRICULAR ACTIVITIES',
-                      'AWARDS & ACHIEVEMENTS', 'VOLUNTEER', 'LANGUAGES', 'INTERESTS',
-                      'TECHNICAL SKILLS', 'PROFESSIONAL EXPERIENCE'
-                  ])):
+            elif kind == 'section':
                 in_skills_section = 'SKILLS' in line
                 doc.add_paragraph()  # Add space before section
                 section_para = doc.add_paragraph()
@@ -73,7 +258,7 @@ def create_download_file(content: str, filename: str, file_type: str) -> bytes:
                 doc.add_paragraph()  # Add space after section header
             
             # Check if it's a job title/company line
-            elif '|' in line and len(line.split('|')) >= 2:
+            elif kind == 'job':
                 job_para = doc.add_paragraph()
                 job_run = job_para.add_run(line)
                 job_run.font.size = Pt(10)
@@ -81,7 +266,7 @@ def create_download_file(content: str, filename: str, file_type: str) -> bytes:
                 job_run.font.name = 'Arial'
             
             # Check if it's a bullet point
-            elif line.startswith('•') or line.startswith('-'):
+            elif kind == 'bullet':
                 bullet_para = doc.add_paragraph()
                 bullet_para.style = 'List Bullet'
                 bullet_run = bullet_para.add_run(line[1:].strip())  # Remove bullet character
@@ -89,7 +274,7 @@ def create_download_file(content: str, filename: str, file_type: str) -> bytes:
                 bullet_run.font.name = 'Arial'
             
             # Check if it's in skills section
-            elif in_skills_section and ':' in line:
+            elif kind == 'skills':
                 skills_para = doc.add_paragraph()
                 skills_run = skills_para.add_run(line)
                 skills_run.font.size = Pt(9)
@@ -101,8 +286,6 @@ def create_download_file(content: str, filename: str, file_type: str) -> bytes:
                 run = para.add_run(line)
                 run.font.size = Pt(9)
                 run.font.name = 'Arial'
-            
-            i += 1
         
         # Save to bytes
         doc_io = io.BytesIO()
@@ -111,6 +294,10 @@ def create_download_file(content: str, filename: str, file_type: str) -> bytes:
         return doc_io.getvalue()
     elif file_type == "pdf":
         try:
+            from reportlab.lib.pagesizes import letter
+            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+            from reportlab.lib.units import inch
+            
             # Create PDF in memory with better margins
             pdf_io = io.BytesIO()
             doc = SimpleDocTemplate(
@@ -122,178 +309,26 @@ def create_download_file(content: str, filename: str, file_type: str) -> bytes:
                 bottomMargin=0.5*inch
             )
             
-            # Create custom styles with better formatting
-            styles = getSampleStyleSheet()
-            
-            # Name style - smaller, bold, left aligned
-            name_style = ParagraphStyle(
-                'NameStyle',
-                parent=styles['Heading1'],
-                fontSize=14,
-                spaceAfter=10,
-                spaceBefore=0,
-                alignment=0,  # Left align
-                textColor=black,
-                fontName='Helvetica-Bold',
-                leading=16
-            )
-            
-            # Contact style - smaller, left aligned
-            contact_style = ParagraphStyle(
-                'ContactStyle',
-                parent=styles['Normal'],
-                fontSize=11,
-                spaceAfter=20,
-                spaceBefore=0,
-                alignment=0,  # Left align
-                fontName='Helvetica',
-                leading=13
-            )
-            
-            # Section header style - smaller, bold, left aligned, perfect spacing
-            section_style = ParagraphStyle(
-                'SectionStyle',
-                parent=styles['Heading2'],
-                fontSize=10,
-                spaceAfter=8,
-                spaceBefore=14,
-                textColor=black,
-                fontName='Helvetica-Bold',
-                alignment=0,  # Left align
-                leftIndent=0,
-                rightIndent=0,
-                leading=12
-            )
-            
-            # Job title/company style - bold, perfect spacing
-            job_title_style = ParagraphStyle(
-                'JobTitleStyle',
-                parent=styles['Normal'],
-                fontSize=11,
-                spaceAfter=6,
-                spaceBefore=0,
-                fontName='Helvetica-Bold',
-                leftIndent=0,
-                rightIndent=0,
-                alignment=0,
-                leading=13
-            )
-            
-            # Normal text style - smaller, perfect spacing
-            normal_style = ParagraphStyle(
-                'NormalStyle',
-                parent=styles['Normal'],
-                fontSize=9,
-                spaceAfter=3,
-                spaceBefore=0,
-                fontName='Helvetica',
-                leftIndent=0,
-                rightIndent=0,
-                alignment=0,
-                leading=11
-            )
-            
-            # Bullet point style with perfect indentation and spacing
-            bullet_style = ParagraphStyle(
-                'BulletStyle',
-                parent=styles['Normal'],
-                fontSize=9,
-                spaceAfter=2,
-                spaceBefore=0,
-                fontName='Helvetica',
-                leftIndent=20,
-                rightIndent=0,
-                alignment=0,
-                leading=11
-            )
-            
-            # Skills style - no bullets, perfect spacing
-            skills_style = ParagraphStyle(
-                'SkillsStyle',
-                parent=styles['Normal'],
-                fontSize=9,
-                spaceAfter=3,
-                spaceBefore=0,
-                fontName='Helvetica',
-                leftIndent=0,
-                rightIndent=0,
-                alignment=0,
-                leading=11
-            )
-            
-            # Date style for cover letters - left aligned
-            date_style = ParagraphStyle(
-                'DateStyle',
-                parent=styles['Normal'],
-                fontSize=10,
-                spaceAfter=15,
-                spaceBefore=0,
-                alignment=0,  # Left align
-                fontName='Helvetica',
-                textColor=black,
-                leading=12
-            )
+            line_styles = get_pdf_styles()
             
             # Build content with improved formatting
             story = []
-            lines = content.split('\n')
-            i = 0
+            is_first = True
             in_skills_section = False
             
-            while i < len(lines):
-                line = lines[i].strip()
+            for line in content.splitlines():
+                line = line.strip()
                 if not line:
-                    i += 1
                     continue
                 
-                # Check if it's a name (first non-empty line, all caps, no special chars)
-                if i == 0 or (line.isupper() and len(line) > 3 and not any(char in line for char in ['|', '@', '.', ':', '•'])):
-                    story.append(Paragraph(line, name_style))
-                    story.append(Spacer(1, 4))
-                
-                # Check if it's contact info (contains email, phone, or LinkedIn)
-                elif ('@' in line or 'linkedin.com' in line.lower() or 
-                      (any(char.isdigit() for char in line) and len(line) > 10) or
-                      'github.com' in line.lower()):
-                    story.append(Paragraph(line, contact_style))
-                    story.append(Spacer(1, 8))
-                
-                # Check if it's a section header
-                elif (line.isupper() and len(line) > 3 and 
-                      any(section in line for section in [
-                          'PROFESSIONAL SUMMARY', 'WORK EXPERIENCE', 'EDUCATION', 
-                          'SKILLS', 'PROJECTS', 'CERTIFICATIONS', 'EXTRACURRICULAR ACTIVITIES',
-                          'AWARDS & ACHIEVEMENTS', 'VOLUNTEER', 'LANGUAGES', 'INTERESTS',
-                          'TECHNICAL SKILLS', 'PROFESSIONAL EXPERIENCE'
-                      ])):
+                kind = classify_line(line, is_first, in_skills_section)
+                is_first = False
+                if kind == 'section':
                     in_skills_section = 'SKILLS' in line
-                    story.append(Paragraph(line, section_style))
-                    story.append(Spacer(1, 6))
-                
-                # Check if it's a date (for cover letters)
-                elif (len(line.split()) <= 3 and 
-                      any(month in line for month in ['January', 'February', 'March', 'April', 'May', 'June',
-                                                      'July', 'August', 'September', 'October', 'November', 'December'])):
-                    story.append(Paragraph(line, date_style))
-                
-                # Check if it's a job title/company line (contains |)
-                elif '|' in line and len(line.split('|')) >= 2:
-                    story.append(Paragraph(line, job_title_style))
-                    story.append(Spacer(1, 2))
-                
-                # Check if it's a bullet point
-                elif line.startswith('•') or line.startswith('-'):
-                    story.append(Paragraph(line, bullet_style))
-                
-                # Check if it's in skills section (format differently)
-                elif in_skills_section and ':' in line:
-                    story.append(Paragraph(line, skills_style))
-                
-                # Regular text
-                else:
-                    story.append(Paragraph(line, normal_style))
                 
-                i += 1
+                story.append(Paragraph(line, line_styles[kind]))
+                if kind in PDF_LINE_SPACING:
+                    story.append(Spacer(1, PDF_LINE_SPACING[kind]))
             
             # Build PDF
             doc.build(story)
@@ -316,8 +351,9 @@ async def export_document(request: ExportRequest):
         if request.format not in ["docx", "pdf"]:
             raise HTTPException(status_code=400, detail="Unsupported file format. Supported formats: docx, pdf")
         
-        # Create file content
-        file_content = create_download_file(request.content, request.filename, request.format)
+        # Build the file in a worker thread so concurrent exports (e.g. the DOCX
+        # and PDF of the same document) overlap instead of queueing on the event loop
+        file_content = await run_in_threadpool(create_download_file, request.content, request.filename, request.format)
         
         if not file_content:
             raise HTTPException(status_code=500, detail="Failed to create file content")
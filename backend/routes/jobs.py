@@ -1,19 +1,80 @@
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
-from database import get_db, Job, SelectedJob, Candidate
+from database import get_db, get_or_create_jobs, Job, SelectedJob, Candidate
 from models import JobSearchRequest, JobSearchResponse, JobResponse, JobSelectionRequest
-from jobspy import scrape_jobs
 import pandas as pd
-from datetime import datetime, timedelta
 from typing import List
+import time
+import logging
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Scrape results keyed by search parameters; repeat searches within the TTL
+# reuse the previous DataFrame instead of hitting LinkedIn again
+SCRAPE_CACHE_TTL_SECONDS = 3600
+SCRAPE_CACHE_SIZE = 64
+_scrape_cache = {}
+
+# Columns search_jobs reads from a scrape; jobspy returns many more, so the
+# rest are dropped before a DataFrame is cached
+JOB_COLUMNS = ['title', 'company', 'location', 'job_url', 'description', 'company_url']
+
+def scrape_linkedin_jobs(search_term: str, location: str, results_wanted: int, hours_old: int) -> pd.DataFrame:
+    """Scrape LinkedIn jobs, caching results per search for SCRAPE_CACHE_TTL_SECONDS"""
+    cache_key = (search_term, location, results_wanted, hours_old)
+    cached = _scrape_cache.get(cache_key)
+    if cached and time.monotonic() - cached[0] < SCRAPE_CACHE_TTL_SECONDS:
+        logger.info("♻️ Using cached scrape for '%s' in %s", search_term, location)
+        return cached[1].copy()
+    
+    # Imported lazily: jobspy pulls in a large dependency tree that only cache misses need
+    from jobspy import scrape_jobs
+    
+    logger.info("🔍 Scraping jobs with term: '%s' in %s", search_term, location)
+    try:
+        jobs_df = scrape_jobs(
+            site_name=["linkedin"],
+            search_term=search_term,
+            location=location,
+            results_wanted=results_wanted,
+            hours_old=hours_old,
+            country_indeed="us",
+            linkedin_fetch_description=True
+        )
+        logger.info("✅ Scraped %d jobs from LinkedIn", len(jobs_df))
+    except Exception as scrape_error:
+        logger.warning("⚠️ LinkedIn scraping failed: %s", scrape_error)
+        # Try with more conservative settings
+        jobs_df = scrape_jobs(
+            site_name=["linkedin"],
+            search_term=search_term,
+            location=location,
+            results_wanted=min(results_wanted, 15),
+            hours_old=hours_old,
+            country_indeed="us",
+            linkedin_fetch_description=False
+        )
+        logger.info("✅ Scraped %d jobs with conservative settings", len(jobs_df))
+    
+    # Keep only the columns we use so cached DataFrames stay small
+    jobs_df = jobs_df[pd.Index(JOB_COLUMNS).intersection(jobs_df.columns)]
+    
+    # Drop expired entries before adding a new one so the cache stays bounded
+    now = time.monotonic()
+    for key in [key for key, (cached_at, _) in _scrape_cache.items() if now - cached_at >= SCRAPE_CACHE_TTL_SECONDS]:
+        del _scrape_cache[key]
+    if len(_scrape_cache) >= SCRAPE_CACHE_SIZE:
+        del _scrape_cache[next(iter(_scrape_cache))]
+    _scrape_cache[cache_key] = (now, jobs_df)
+    
+    return jobs_df.copy()
 
 @router.post("/search", response_model=JobSearchResponse)
 async def search_jobs(request: JobSearchRequest, db: Session = Depends(get_db)):
     """Search for jobs using multiple sources"""
     
-    print(f"🔍 Job search request: {request.job_titles} in {request.location}")
+    logger.info("🔍 Job search request: %s in %s", request.job_titles, request.location)
     
     try:
         # Prepare search parameters
@@ -27,32 +88,9 @@ async def search_jobs(request: JobSearchRequest, db: Session = Depends(get_db)):
         optimized_results = min(request.num_results, 30)  # Cap at 30 for faster results
         optimized_days = min(request.posted_within_days, 14)  # Cap at 14 days for speed
         
-        # Scrape jobs with optimized settings
-        print(f"🔍 Scraping jobs with term: '{search_term}' in {request.location}")
-        try:
-            jobs_df = scrape_jobs(
-                site_name=["linkedin"],
-                search_term=search_term,
-                location=request.location if request.location else "United States",
-                results_wanted=optimized_results,
-                hours_old=optimized_days * 24,
-                country_indeed="us",
-                linkedin_fetch_description=True
-            )
-            print(f"✅ Scraped {len(jobs_df)} jobs from LinkedIn")
-        except Exception as scrape_error:
-            print(f"⚠️ LinkedIn scraping failed: {scrape_error}")
-            # Try with more conservative settings
-            jobs_df = scrape_jobs(
-                site_name=["linkedin"],
-                search_term=search_term,
-                location=request.location if request.location else "United States",
-                results_wanted=min(optimized_results, 15),
-                hours_old=optimized_days * 24,
-                country_indeed="us",
-                linkedin_fetch_description=False
-            )
-            print(f"✅ Scraped {len(jobs_df)} jobs with conservative settings")
+        # Scrape jobs with optimized settings (served from cache for repeat searches)
+        location = request.location if request.location else "United States"
+        jobs_df = scrape_linkedin_jobs(search_term, location, optimized_results, optimized_days * 24)
         
         if jobs_df.empty:
             return JobSearchResponse(
@@ -61,82 +99,32 @@ async def search_jobs(request: JobSearchRequest, db: Session = Depends(get_db)):
                 search_params=request
             )
         
+        # Build a single row mask so filtering happens in one selection
+        # instead of producing an intermediate DataFrame per step
+        mask = pd.Series(True, index=jobs_df.index)
+        
         # Filter for remote jobs if requested
         if request.remote_only:
-            jobs_df = jobs_df[jobs_df['location'].str.contains('remote|Remote|REMOTE', case=False, na=False)]
-        
-        # Select and rename columns
-        job_columns = ['title', 'company', 'location', 'job_url', 'description', 'company_url']
-        available_columns = [col for col in job_columns if col in jobs_df.columns]
+            mask &= jobs_df['location'].str.contains('remote', case=False, na=False, regex=False)
         
-        result_df = jobs_df[available_columns].copy()
-        
-        # Rename columns to match expected format
-        column_mapping = {}
-        for i, col in enumerate(available_columns):
-            if i < len(job_columns):
-                column_mapping[col] = job_columns[i]
-        result_df = result_df.rename(columns=column_mapping)
+        # Filter out jobs without descriptions
+        if 'description' in jobs_df.columns:
+            mask &= jobs_df['description'].fillna('').str.len() > 30
+        
+        # Dedupe and limit final results for better performance
+        result_df = (
+            jobs_df.loc[mask]
+            .drop_duplicates(subset=['job_url'])
+            .head(25)
+            .fillna('N/A')
+        )
         
-        # Clean up the data efficiently
-        result_df = result_df.fillna('N/A')
-        result_df = result_df.drop_duplicates(subset=['job_url'])
+        # Look up or insert every result job in one batch (plain dict records
+        # avoid building a pandas Series per row as iterrows() does)
+        db_jobs = get_or_create_jobs(db, result_df.to_dict('records'))
         
-        # Filter out jobs without descriptions
-        if 'description' in result_df.columns:
-            result_df = result_df[result_df['description'] != 'N/A']
-            result_df = result_df[result_df['description'].str.len() > 30]
-        
-        # Limit final results for better performance
-        result_df = result_df.head(min(len(result_df), 25))
-        
-        # Convert to list of JobResponse objects
-        jobs = []
-        for _, row in result_df.iterrows():
-            # Check if job already exists in database
-            existing_job = db.query(Job).filter(Job.job_url == row['job_url']).first()
-            
-            if existing_job:
-                job_response = JobResponse(
-                    id=existing_job.id,
-                    title=existing_job.title,
-                    company=existing_job.company,
-                    location=existing_job.location,
-                    description=existing_job.description,
-                    job_url=existing_job.job_url,
-                    company_url=existing_job.company_url,
-                    source=existing_job.source,
-                    posted_date=existing_job.posted_date
-                )
-            else:
-                # Create new job in database
-                new_job = Job(
-                    title=row['title'],
-                    company=row['company'],
-                    location=row['location'],
-                    description=row['description'],
-                    job_url=row['job_url'],
-                    company_url=row['company_url'],
-                    source='scraped',
-                    scraped_at=datetime.utcnow()
-                )
-                db.add(new_job)
-                db.commit()
-                db.refresh(new_job)
-                
-                job_response = JobResponse(
-                    id=new_job.id,
-                    title=new_job.title,
-                    company=new_job.company,
-                    location=new_job.location,
-                    description=new_job.description,
-                    job_url=new_job.job_url,
-                    company_url=new_job.company_url,
-                    source=new_job.source,
-                    posted_date=new_job.posted_date
-                )
-            
-            jobs.append(job_response)
+        # Convert to list of JobResponse objects, read straight from the ORM rows
+        jobs = [JobResponse.model_validate(job) for job in db_jobs]
         
         return JobSearchResponse(
             jobs=jobs,
@@ -210,20 +198,7 @@ async def get_selected_jobs(candidate_id: int, db: Session = Depends(get_db)):
             SelectedJob.candidate_id == candidate_id
         ).all()
         
-        jobs = []
-        for selection in selected_jobs:
-            job = selection.job
-            jobs.append(JobResponse(
-                id=job.id,
-                title=job.title,
-                company=job.company,
-                location=job.location,
-                description=job.description,
-                job_url=job.job_url,
-                company_url=job.company_url,
-                source=job.source,
-                posted_date=job.posted_date
-            ))
+        jobs = [JobResponse.model_validate(selection.job) for selection in selected_jobs]
         
         return {
             "candidate_id": candidate_id,
@@ -13,12 +13,72 @@ const AIGeneration = () => {
   const [generationStep, setGenerationStep] = useState('')
   const [showModal, setShowModal] = useState(false)
   const [modalContent, setModalContent] = useState({ type: '', title: '', message: '' })
+  const [streamedContent, setStreamedContent] = useState({ resume: '', cover_letter: '' })
 
   const showNotification = (type, title, message) => {
     setModalContent({ type, title, message })
     setShowModal(true)
   }
 
+  // Request a document as server-sent events, showing the text as it arrives,
+  // and resolve with the complete document once the done event is received
+  const streamGeneration = async (contentType) => {
+    const response = await fetch('/api/ai/generate?stream=true', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Accept': 'text/event-stream',
+      },
+      body: JSON.stringify({
+        contentType,
+        resume_data: workflowData.resumeData,
+        job_description: workflowData.selectedJob.description || '',
+        job_title: workflowData.selectedJob.title || '',
+        company_name: workflowData.selectedJob.company || ''
+      })
+    })
+
+    if (!response.ok) {
+      throw new Error(`Failed to generate ${contentType}`)
+    }
+
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+    let content = ''
+    let completed = false
+
+    while (!completed) {
+      const { done, value } = await reader.read()
+      if (done) break
+      buffer += decoder.decode(value, { stream: true })
+
+      // Events are separated by a blank line; keep any partial event for the next read
+      const events = buffer.split('\n\n')
+      buffer = events.pop()
+      for (const event of events) {
+        const lines = event.split('\n')
+        const eventType = lines.find(line => line.startsWith('event: '))?.slice(7) || 'message'
+        const data = JSON.parse(lines.find(line => line.startsWith('data: '))?.slice(6) || '{}')
+
+        if (eventType === 'error') {
+          throw new Error(data.detail || `Failed to generate ${contentType}`)
+        }
+        if (eventType === 'done') {
+          completed = true
+          break
+        }
+        content += data.content
+        setStreamedContent(prev => ({ ...prev, [contentType]: content }))
+      }
+    }
+
+    if (!completed || !content) {
+      throw new Error(`Failed to generate ${contentType}`)
+    }
+    return content
+  }
+
   const handleGenerate = async () => {
     if (!workflowData.resumeData || !workflowData.selectedJob) {
       showNotification('error', 'Missing Data', 'Please ensure you have uploaded a resume and selected a job.')
@@ -26,53 +86,18 @@ const AIGeneration = () => {
     }
 
     setIsGenerating(true)
+    setStreamedContent({ resume: '', cover_letter: '' })
     
     try {
-      // Generate Resume
-      setGenerationStep('Customizing your resume...')
-      const resumeResponse = await fetch('/api/ai/generate', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          contentType: 'resume',
-          resume_data: workflowData.resumeData,
-          job_description: workflowData.selectedJob.description || '',
-          job_title: workflowData.selectedJob.title || '',
-          company_name: workflowData.selectedJob.company || ''
-        })
-      })
-
-      if (!resumeResponse.ok) {
-        throw new Error('Failed to generate resume')
-      }
-
-      const resumeData = await resumeResponse.json()
-      updateWorkflowData('generatedResume', resumeData.content)
+      // Generate the resume and cover letter concurrently; they are independent requests
+      setGenerationStep('Customizing your resume and creating your cover letter...')
+      const [generatedResume, generatedCoverLetter] = await Promise.all([
+        streamGeneration('resume'),
+        streamGeneration('cover_letter')
+      ])
 
-      // Generate Cover Letter
-      setGenerationStep('Creating your cover letter...')
-      const coverLetterResponse = await fetch('/api/ai/generate', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          contentType: 'cover_letter',
-          resume_data: workflowData.resumeData,
-          job_description: workflowData.selectedJob.description || '',
-          job_title: workflowData.selectedJob.title || '',
-          company_name: workflowData.selectedJob.company || ''
-        })
-      })
-
-      if (!coverLetterResponse.ok) {
-        throw new Error('Failed to generate cover letter')
-      }
-
-      const coverLetterData = await coverLetterResponse.json()
-      updateWorkflowData('generatedCoverLetter', coverLetterData.content)
+      updateWorkflowData('generatedResume', generatedResume)
+      updateWorkflowData('generatedCoverLetter', generatedCoverLetter)
 
       showNotification('success', 'Generation Complete', 'Your personalized resume and cover letter are ready!')
       
@@ -214,6 +239,24 @@ const AIGeneration = () => {
               <div className="w-full bg-gray-200 rounded-full h-2 mt-4">
                 <div className="bg-gradient-to-r from-blue-600 to-purple-600 h-2 rounded-full animate-pulse" style={{ width: '60%' }} />
               </div>
+
+              {/* Live preview of the documents as they are generated */}
+              {(streamedContent.resume || streamedContent.cover_letter) && (
+                <div className="grid grid-cols-1 lg:grid-cols-2 gap-4 mt-6 text-left">
+                  <div>
+                    <h4 className="font-medium text-gray-900 mb-2">Resume</h4>
+                    <pre className="whitespace-pre-wrap text-xs text-gray-700 bg-gray-50 rounded-lg p-3 h-64 overflow-y-auto">
+                      {streamedContent.resume}
+                    </pre>
+                  </div>
+                  <div>
+                    <h4 className="font-medium text-gray-900 mb-2">Cover Letter</h4>
+                    <pre className="whitespace-pre-wrap text-xs text-gray-700 bg-gray-50 rounded-lg p-3 h-64 overflow-y-auto">
+                      {streamedContent.cover_letter}
+                    </pre>
+                  </div>
+                </div>
+              )}
             </Card.Content>
           </Card>
         )}